@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Hashable
+
+
+class ResponseCache:
+    """In-process TTL cache for serialized JSON response bodies."""
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self._maxsize = maxsize
+        self._entries: dict[tuple[Hashable, ...], tuple[float, str]] = {}
+        # Bumped by invalidate(), so a body built before a write can't be stored after it
+        self._generations: dict[tuple[Hashable, ...], int] = {}
+        self._lock = threading.Lock()
+
+    def _generation(self, key: tuple[Hashable, ...]) -> tuple[int, ...]:
+        # Every prefix of key, including (), since invalidate() may target any of them
+        return tuple(self._generations.get(key[:size], 0) for size in range(len(key) + 1))
+
+    def get(self, key: tuple[Hashable, ...]) -> str | None:
+        """
+        Get a cached body if it has not expired.
+
+        Args:
+            key: Cache key tuple, e.g. ("team", 2024, 3)
+
+        Returns:
+            Cached JSON body, or None on miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, body = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return body
+
+    def generation(self, key: tuple[Hashable, ...]) -> tuple[int, ...]:
+        """
+        Capture the invalidation generation of a key before reading the data behind it.
+
+        Args:
+            key: Cache key tuple
+
+        Returns:
+            Opaque token to pass to set()
+        """
+        with self._lock:
+            return self._generation(key)
+
+    def set(
+        self,
+        key: tuple[Hashable, ...],
+        body: str,
+        ttl_seconds: float,
+        generation: tuple[int, ...] | None = None,
+    ) -> None:
+        """
+        Store a body for ttl_seconds, evicting the oldest entry when full.
+
+        Args:
+            key: Cache key tuple
+            body: Serialized JSON body
+            ttl_seconds: Time to live in seconds
+            generation: Token from generation(), taken before the body was built;
+                the store is skipped if the key was invalidated since
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation(key):
+                return
+            if key not in self._entries and len(self._entries) >= self._maxsize:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic() + ttl_seconds, body)
+
+    def invalidate(self, *prefix: Hashable) -> None:
+        """
+        Drop every entry whose key starts with prefix.
+
+        Args:
+            prefix: Leading key parts, e.g. ("team",) or ("team", 2024)
+        """
+        size = len(prefix)
+        with self._lock:
+            self._generations[prefix] = self._generations.get(prefix, 0) + 1
+            for key in [k for k in self._entries if k[:size] == prefix]:
+                del self._entries[key]
+
+
+response_cache = ResponseCache()
@@ -1,17 +1,40 @@
 from __future__ import annotations
 
 import logging
+from collections import defaultdict
 from datetime import date
 
-from sqlalchemy import select, delete as sql_delete
-from sqlalchemy.orm import Session
+from sqlalchemy import case, func, insert, lambda_stmt, select, update, delete as sql_delete
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session, lazyload, selectinload
 from sqlalchemy.exc import IntegrityError
 
 from . import models
-from .utils import month_days, weekday_name, is_weekend
+from .database import IS_MYSQL, IS_POSTGRES, IS_SQLITE
+from .utils import WEEKDAY_NAMES, month_days
 
 logger = logging.getLogger(__name__)
 
+# Prebuilt counting statements; per-call filters are appended as lambdas so the
+# statement cache key is computed once instead of rebuilding the select tree
+_COUNT_REMOTE_BY_YEAR = lambda_stmt(
+    lambda: select(func.count())
+    .select_from(models.UserDayStatus)
+    .join(models.CalendarDay)
+    .join(models.CalendarMonth)
+    .where(models.UserDayStatus.status == models.DayStatus.remote)
+)
+_COUNT_VACATION_BY_YEAR = lambda_stmt(
+    lambda: select(func.count())
+    .select_from(models.UserDayStatus)
+    .join(models.CalendarDay)
+    .join(models.CalendarMonth)
+    .where(models.UserDayStatus.status == models.DayStatus.vacation)
+)
+
+# (year, month) -> CalendarMonth.id; month rows are never deleted, so ids stay valid
+_month_id_cache: dict[tuple[int, int], int] = {}
+
 
 def get_or_create_month(db: Session, year: int, month: int) -> models.CalendarMonth:
     """
@@ -28,14 +51,27 @@ def get_or_create_month(db: Session, year: int, month: int) -> models.CalendarMo
     Raises:
         IntegrityError: If concurrent creation fails
     """
-    # Try to fetch existing month
+    # Resolve through the id cache first; db.get hits the session identity map
+    cached_id = _month_id_cache.get((year, month))
+    if cached_id is not None:
+        month_obj = db.get(
+            models.CalendarMonth, cached_id, options=[selectinload(models.CalendarMonth.days)]
+        )
+        if month_obj and month_obj.year == year and month_obj.month == month:
+            return month_obj
+        _month_id_cache.pop((year, month), None)
+
+    # Try to fetch existing month; days come in one extra IN query, not a JOIN
     month_obj = db.scalar(
-        select(models.CalendarMonth).where(
+        select(models.CalendarMonth)
+        .options(selectinload(models.CalendarMonth.days))
+        .where(
             models.CalendarMonth.year == year,
             models.CalendarMonth.month == month,
         )
     )
     if month_obj:
+        _month_id_cache[(year, month)] = month_obj.id
         return month_obj
 
     # Create new month
@@ -47,6 +83,7 @@ def get_or_create_month(db: Session, year: int, month: int) -> models.CalendarMo
     except IntegrityError:
         # Handle race condition - another process created it
         db.rollback()
+        _month_id_cache.pop((year, month), None)
         month_obj = db.scalar(
             select(models.CalendarMonth).where(
                 models.CalendarMonth.year == year,
@@ -55,58 +92,164 @@ def get_or_create_month(db: Session, year: int, month: int) -> models.CalendarMo
         )
         if month_obj:
             logger.info(f"Month {year}-{month:02d} already exists (race condition)")
+            _month_id_cache[(year, month)] = month_obj.id
             return month_obj
         raise
 
-    # Create all days for the month
+    # Create all days for the month in a single multi-row INSERT
+    rows = []
     for day in month_days(year, month):
-        day_obj = models.CalendarDay(
-            month_id=month_obj.id,
-            date=day,
-            weekday_name=weekday_name(day),
-            is_weekend=is_weekend(day),
-            is_holiday=False,
-        )
-        db.add(day_obj)
+        wd = day.weekday()
+        rows.append({
+            "month_id": month_obj.id,
+            "date": day,
+            "weekday_name": WEEKDAY_NAMES[wd],
+            "is_weekend": wd >= 5,
+            "is_holiday": False,
+        })
+    db.execute(insert(models.CalendarDay.__table__).values(rows))
 
+    month_id = month_obj.id
     db.commit()
-    db.refresh(month_obj)
-    logger.info(f"Created month {year}-{month:02d} with {len(month_obj.days)} days")
+    # No refresh: the expired month (and its days) reloads on first attribute access
+    _month_id_cache[(year, month)] = month_id
+    logger.info(f"Created month {year}-{month:02d} with {len(rows)} days")
     return month_obj
 
 
-def upsert_user_day_status(
+def get_day(db: Session, year: int, month: int, day_date: date) -> models.CalendarDay | None:
+    """
+    Get a single calendar day by its natural key, creating the month if needed.
+    
+    Args:
+        db: Database session
+        year: Year (e.g., 2024)
+        month: Month (1-12)
+        day_date: Date of the day within the month
+    
+    Returns:
+        CalendarDay object, or None if day_date is not in the given month
+    """
+    stmt = (
+        select(models.CalendarDay)
+        .join(models.CalendarDay.month)
+        .where(
+            models.CalendarMonth.year == year,
+            models.CalendarMonth.month == month,
+            models.CalendarDay.date == day_date,
+        )
+        .options(lazyload(models.CalendarDay.month))
+    )
+    day = db.scalar(stmt)
+    if day is None:
+        # Month rows may not exist yet; create them and look again
+        get_or_create_month(db, year, month)
+        day = db.scalar(stmt)
+    return day
+
+
+def update_day(
     db: Session,
-    user_id: int,
-    day: models.CalendarDay,
-    status: models.DayStatus,
-) -> models.UserDayStatus:
+    year: int,
+    month: int,
+    day_date: date,
+    values: dict[str, bool],
+) -> models.CalendarDay | None:
     """
-    Create or update user's day status.
+    Update flags on a single calendar day addressed by its natural key.
+    
+    The fast path is one UPDATE ... RETURNING; the month is only created
+    (and the UPDATE retried) when the day row does not exist yet.
     
     Args:
         db: Database session
-        user_id: User ID
-        day: CalendarDay object
-        status: DayStatus enum value
+        year: Year (e.g., 2024)
+        month: Month (1-12)
+        day_date: Date of the day within the month
+        values: Column values to set, e.g. {"is_holiday": True}
     
     Returns:
-        UserDayStatus object (created or updated)
+        Updated CalendarDay object, or None if day_date is not in the given month
     """
-    existing = db.scalar(
-        select(models.UserDayStatus).where(
-            models.UserDayStatus.user_id == user_id,
-            models.UserDayStatus.day_id == day.id,
+    stmt = (
+        update(models.CalendarDay)
+        .where(
+            models.CalendarDay.month_id.in_(
+                select(models.CalendarMonth.id).where(
+                    models.CalendarMonth.year == year,
+                    models.CalendarMonth.month == month,
+                )
+            ),
+            models.CalendarDay.date == day_date,
         )
+        .values(**values)
     )
-    if existing:
-        existing.status = status
-        db.add(existing)
-        return existing
 
-    new_status = models.UserDayStatus(user_id=user_id, day_id=day.id, status=status)
-    db.add(new_status)
-    return new_status
+    def run() -> models.CalendarDay | None:
+        if db.get_bind().dialect.update_returning:
+            return db.scalar(stmt.returning(models.CalendarDay))
+        # No UPDATE ... RETURNING (e.g. MySQL): load the row separately
+        if db.execute(stmt).rowcount == 0:
+            return None
+        return get_day(db, year, month, day_date)
+
+    day = run()
+    if day is None:
+        get_or_create_month(db, year, month)
+        day = run()
+    return day
+
+
+def upsert_user_day_statuses(
+    db: Session,
+    user_id: int,
+    pairs: list[tuple[int, models.DayStatus]],
+) -> None:
+    """
+    Create or update many of a user's day statuses in one statement.
+    
+    Uses ON CONFLICT (PostgreSQL, SQLite) or ON DUPLICATE KEY (MySQL) against
+    the (user_id, day_id) unique constraint; other dialects fall back to
+    SELECT followed by INSERT/UPDATE per row.
+    
+    Args:
+        db: Database session
+        user_id: User ID
+        pairs: List of (day_id, DayStatus) tuples
+    """
+    if not pairs:
+        return
+    rows = [{"user_id": user_id, "day_id": day_id, "status": status} for day_id, status in pairs]
+    if IS_POSTGRES or IS_SQLITE:
+        dialect_insert = postgresql.insert if IS_POSTGRES else sqlite.insert
+        stmt = dialect_insert(models.UserDayStatus)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "day_id"],
+            set_={"status": stmt.excluded.status},
+        )
+        db.execute(stmt, rows)
+        return
+    if IS_MYSQL:
+        stmt = mysql.insert(models.UserDayStatus)
+        db.execute(stmt.on_duplicate_key_update(status=stmt.inserted.status), rows)
+        return
+
+    existing = {
+        entry.day_id: entry
+        for entry in db.scalars(
+            select(models.UserDayStatus).where(
+                models.UserDayStatus.user_id == user_id,
+                models.UserDayStatus.day_id.in_([row["day_id"] for row in rows]),
+            )
+        )
+    }
+    for row in rows:
+        entry = existing.get(row["day_id"])
+        if entry:
+            entry.status = row["status"]
+            db.add(entry)
+        else:
+            db.add(models.UserDayStatus(**row))
 
 
 def count_remote_days(db: Session, user_id: int, year: int) -> int:
@@ -121,15 +264,11 @@ def count_remote_days(db: Session, user_id: int, year: int) -> int:
     Returns:
         Number of remote work days
     """
-    result = db.scalars(
-        select(models.UserDayStatus)
-        .join(models.CalendarDay)
-        .join(models.CalendarMonth)
-        .where(models.UserDayStatus.user_id == user_id)
+    stmt = _COUNT_REMOTE_BY_YEAR + (
+        lambda s: s.where(models.UserDayStatus.user_id == user_id)
         .where(models.CalendarMonth.year == year)
-        .where(models.UserDayStatus.status == models.DayStatus.remote)
-    ).unique().all()
-    return len(result)
+    )
+    return db.scalar(stmt)
 
 
 def count_vacation_days(
@@ -150,20 +289,15 @@ def count_vacation_days(
     Returns:
         Number of vacation days
     """
-    query = (
-        select(models.UserDayStatus)
-        .join(models.CalendarDay)
-        .join(models.CalendarMonth)
-        .where(models.UserDayStatus.user_id == user_id)
+    stmt = _COUNT_VACATION_BY_YEAR + (
+        lambda s: s.where(models.UserDayStatus.user_id == user_id)
         .where(models.CalendarMonth.year == year)
-        .where(models.UserDayStatus.status == models.DayStatus.vacation)
     )
     
     if month is not None:
-        query = query.where(models.CalendarMonth.month == month)
+        stmt += lambda s: s.where(models.CalendarMonth.month == month)
     
-    result = db.scalars(query).unique().all()
-    return len(result)
+    return db.scalar(stmt)
 
 
 def get_vacation_dates(db: Session, user_id: int, year: int) -> list[date]:
@@ -190,32 +324,39 @@ def get_vacation_dates(db: Session, user_id: int, year: int) -> list[date]:
     return list(result)
 
 
-def count_remote_days_until(db: Session, user_id: int, year: int, end_date: date) -> int:
+def count_remote_days_bulk(
+    db: Session,
+    year: int,
+    cutoffs: list[date],
+) -> dict[int, tuple[int, ...]]:
     """
-    Count remote work days for a user up to a specific date.
+    Count remote work days for all users up to several dates in one query.
     
     Args:
         db: Database session
-        user_id: User ID
         year: Year to count
-        end_date: End date (inclusive)
+        cutoffs: End dates (inclusive); counts start at January 1st of year
     
     Returns:
-        Number of remote work days from year start to end_date
+        Dictionary mapping user_id to a tuple of counts, one per cutoff.
+        Users without remote days in range are omitted.
     """
     year_start = date(year, 1, 1)
-    if end_date < year_start:
-        return 0
-    
-    result = db.scalars(
-        select(models.UserDayStatus)
-        .join(models.CalendarDay)
-        .where(models.UserDayStatus.user_id == user_id)
+    rows = db.execute(
+        select(
+            models.UserDayStatus.user_id,
+            *(
+                func.sum(case((models.CalendarDay.date <= cutoff, 1), else_=0))
+                for cutoff in cutoffs
+            ),
+        )
+        .join(models.UserDayStatus.day)
         .where(models.UserDayStatus.status == models.DayStatus.remote)
         .where(models.CalendarDay.date >= year_start)
-        .where(models.CalendarDay.date <= end_date)
-    ).unique().all()
-    return len(result)
+        .where(models.CalendarDay.date <= max(cutoffs))
+        .group_by(models.UserDayStatus.user_id)
+    ).all()
+    return {user_id: tuple(int(count) for count in counts) for user_id, *counts in rows}
 
 
 def get_statuses_for_user_month(
@@ -234,83 +375,74 @@ def get_statuses_for_user_month(
     Returns:
         Dictionary mapping date to DayStatus
     """
-    statuses = db.scalars(
-        select(models.UserDayStatus)
-        .join(models.CalendarDay)
+    rows = db.execute(
+        select(models.CalendarDay.date, models.UserDayStatus.status)
+        .join(models.UserDayStatus.day)
         .where(models.UserDayStatus.user_id == user_id)
         .where(models.CalendarDay.month_id == month.id)
-    ).unique().all()
-    return {s.day.date: s.status for s in statuses}
-
-
-def get_statuses_for_month(
-    db: Session,
-    month: models.CalendarMonth,
-) -> dict[int, dict[date, models.DayStatus]]:
-    """
-    Get all day statuses for all users in a month.
-    
-    Args:
-        db: Database session
-        month: CalendarMonth object
-    
-    Returns:
-        Dictionary mapping user_id to dict of date to DayStatus
-    """
-    statuses = db.scalars(
-        select(models.UserDayStatus)
-        .join(models.CalendarDay)
-        .where(models.CalendarDay.month_id == month.id)
-    ).unique().all()
-    result: dict[int, dict[date, models.DayStatus]] = {}
-    for entry in statuses:
-        result.setdefault(entry.user_id, {})[entry.day.date] = entry.status
-    return result
+    ).all()
+    return {day_date: status for day_date, status in rows}
 
 
-def get_notes_for_month(
+def get_month_view(
     db: Session,
     month: models.CalendarMonth,
-) -> dict[int, dict[date, str | None]]:
+) -> tuple[dict[int, dict[date, models.DayStatus]], dict[int, dict[date, str | None]]]:
     """
-    Get all notes for all users in a month.
+    Get all day statuses and notes for all users in a month with one query.
     
     Args:
         db: Database session
         month: CalendarMonth object
     
     Returns:
-        Dictionary mapping user_id to dict of date to note text
+        Tuple of (status map, notes map), each mapping user_id to dict of date to value
     """
-    statuses = db.scalars(
-        select(models.UserDayStatus)
-        .join(models.CalendarDay)
+    rows = db.execute(
+        select(
+            models.UserDayStatus.user_id,
+            models.CalendarDay.date,
+            models.UserDayStatus.status,
+            models.UserDayStatus.note,
+        )
+        .join(models.UserDayStatus.day)
         .where(models.CalendarDay.month_id == month.id)
-    ).unique().all()
-    result: dict[int, dict[date, str | None]] = {}
-    for entry in statuses:
-        result.setdefault(entry.user_id, {})[entry.day.date] = entry.note
-    return result
+        .execution_options(yield_per=500)  # stream in batches instead of buffering all rows
+    )
+    statuses: defaultdict[int, dict[date, models.DayStatus]] = defaultdict(dict)
+    notes: defaultdict[int, dict[date, str | None]] = defaultdict(dict)
+    for user_id, day_date, status, note in rows:
+        statuses[user_id][day_date] = status
+        notes[user_id][day_date] = note
+    return dict(statuses), dict(notes)
 
 
 def delete_user_month_statuses(
     db: Session,
     user_id: int,
     month: models.CalendarMonth,
+    keep_day_ids: list[int] | None = None,
 ) -> None:
     """
-    Delete all status entries for a user in a specific month.
+    Delete status entries for a user in a specific month.
     
     Args:
         db: Database session
         user_id: User ID
         month: CalendarMonth object
+        keep_day_ids: Optional day IDs whose entries are left in place
     """
-    day_ids = [day.id for day in month.days]
-    stmt = sql_delete(models.UserDayStatus).where(
-        models.UserDayStatus.user_id == user_id,
-        models.UserDayStatus.day_id.in_(day_ids),
+    month_day_ids = select(models.CalendarDay.id).where(models.CalendarDay.month_id == month.id)
+    stmt = (
+        sql_delete(models.UserDayStatus)
+        .where(
+            models.UserDayStatus.user_id == user_id,
+            models.UserDayStatus.day_id.in_(month_day_ids),
+        )
+        .execution_options(synchronize_session=False)
     )
+    if keep_day_ids:
+        stmt = stmt.where(models.UserDayStatus.day_id.not_in(keep_day_ids))
     db.execute(stmt)
     logger.debug(f"Deleted statuses for user {user_id} in month {month.year}-{month.month:02d}")
 
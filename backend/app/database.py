@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 import os
-from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Generator
 
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, event, pool
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
 
 # Load environment variables from .env file
@@ -20,25 +20,38 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./officecalendar.db")
 engine_kwargs = {
     "echo": os.getenv("SQL_ECHO", "false").lower() == "true",
     "pool_pre_ping": True,  # Verify connections before using
+    # Compiled-statement LRU; default is 500, raise it so repeated calendar queries stay cached
+    "query_cache_size": int(os.getenv("DB_QUERY_CACHE_SIZE", "1200")),
 }
 
-is_mysql = "mysql" in DATABASE_URL.lower()
-is_postgresql = "postgresql" in DATABASE_URL.lower() or "postgres" in DATABASE_URL.lower()
+# Resolved once from the URL's scheme (not a substring match, which a host name can fool),
+# so both engine setup and request-path code branch on the same flags
+DIALECT = make_url(DATABASE_URL).get_backend_name()
+IS_POSTGRES = DIALECT == "postgresql"
+IS_SQLITE = DIALECT == "sqlite"
+IS_MYSQL = DIALECT in ("mysql", "mariadb")
 
-if DATABASE_URL.startswith("sqlite"):
+if IS_SQLITE:
     # SQLite configuration
     engine_kwargs["connect_args"] = {"check_same_thread": False}
     engine_kwargs["poolclass"] = pool.StaticPool  # Better for SQLite
-elif is_postgresql:
+elif IS_POSTGRES:
     # PostgreSQL/Supabase configuration
-    engine_kwargs["pool_size"] = int(os.getenv("DB_POOL_SIZE", "5"))
-    engine_kwargs["max_overflow"] = int(os.getenv("DB_MAX_OVERFLOW", "10"))
-    engine_kwargs["pool_timeout"] = int(os.getenv("DB_POOL_TIMEOUT", "30"))
-    engine_kwargs["pool_recycle"] = int(os.getenv("DB_POOL_RECYCLE", "3600"))
-elif is_mysql:
+    if os.getenv("DB_USE_PGBOUNCER", "false").lower() == "true":
+        # PgBouncer (transaction pooling) owns the pool; don't stack a second one on top
+        engine_kwargs["poolclass"] = pool.NullPool
+        # psycopg 3 prepares server-side after 5 executions; under transaction pooling the
+        # next transaction may land on a backend that never saw (or already has) that statement
+        engine_kwargs["connect_args"] = {"prepare_threshold": None}
+    else:
+        engine_kwargs["pool_size"] = int(os.getenv("DB_POOL_SIZE", "20"))
+        engine_kwargs["max_overflow"] = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+        engine_kwargs["pool_timeout"] = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+        engine_kwargs["pool_recycle"] = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+elif IS_MYSQL:
     # MySQL/Aurora configuration
-    engine_kwargs["pool_size"] = int(os.getenv("DB_POOL_SIZE", "5"))
-    engine_kwargs["max_overflow"] = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    engine_kwargs["pool_size"] = int(os.getenv("DB_POOL_SIZE", "20"))
+    engine_kwargs["max_overflow"] = int(os.getenv("DB_MAX_OVERFLOW", "40"))
     engine_kwargs["pool_timeout"] = int(os.getenv("DB_POOL_TIMEOUT", "30"))
     engine_kwargs["pool_recycle"] = int(os.getenv("DB_POOL_RECYCLE", "3600"))
     # MySQL specific settings
@@ -48,19 +61,25 @@ elif is_mysql:
     }
 else:
     # Other database defaults
-    engine_kwargs["pool_size"] = int(os.getenv("DB_POOL_SIZE", "5"))
-    engine_kwargs["max_overflow"] = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    engine_kwargs["pool_size"] = int(os.getenv("DB_POOL_SIZE", "20"))
+    engine_kwargs["max_overflow"] = int(os.getenv("DB_MAX_OVERFLOW", "40"))
     engine_kwargs["pool_timeout"] = int(os.getenv("DB_POOL_TIMEOUT", "30"))
     engine_kwargs["pool_recycle"] = int(os.getenv("DB_POOL_RECYCLE", "3600"))
 
 engine = create_engine(DATABASE_URL, **engine_kwargs)
 
-# Enable foreign keys for SQLite
-if DATABASE_URL.startswith("sqlite"):
+# Enable foreign keys and tune I/O for SQLite
+if IS_SQLITE:
     @event.listens_for(engine, "connect")
     def set_sqlite_pragma(dbapi_conn, connection_record):
         cursor = dbapi_conn.cursor()
         cursor.execute("PRAGMA foreign_keys=ON")
+        # WAL lets readers run alongside the writer; NORMAL sync is safe in WAL mode
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB
+        cursor.execute("PRAGMA temp_store=MEMORY")
         cursor.close()
 
 # For PostgreSQL/Supabase, no special event listeners needed as it handles everything well
@@ -73,7 +92,7 @@ class Base(DeclarativeBase):
     pass
 
 
-def get_db() -> AsyncGenerator[Session, None]:
+def get_db() -> Generator[Session, None, None]:
     """Dependency for database sessions."""
     db = SessionLocal()
     try:
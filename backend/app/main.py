@@ -2,21 +2,27 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
+import time
 from contextlib import asynccontextmanager
 from datetime import date, timedelta
 from typing import Annotated
 from pathlib import Path
 
+import anyio.to_thread
 from fastapi import Depends, FastAPI, Header, HTTPException, status, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy.orm import Session
-from sqlalchemy import select
-
-from .database import Base, SessionLocal, engine, get_db as database_get_db
-from . import crud, models, schemas
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.orm import Session, joinedload, lazyload, make_transient_to_detached, raiseload, selectinload
+from sqlalchemy import and_, delete, exists, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from .database import Base, engine, get_db
+from . import crud, models, schemas, utils
+from .cache import response_cache
 from . import seed as seed_module
 
 # Configure logging
@@ -29,6 +35,37 @@ logger = logging.getLogger(__name__)
 # Environment configuration
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
+# Worker threads for sync endpoints (AnyIO defaults to 40); sized to the DB pool + overflow
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "60"))
+# Create tables on first authenticated request instead of at startup (e.g. for tests)
+LAZY_DB_INIT = os.getenv("LAZY_DB_INIT", "false").lower() == "true"
+
+# Response cache TTLs (seconds); entries are also invalidated by the write endpoints
+DEPARTMENTS_CACHE_TTL = float(os.getenv("DEPARTMENTS_CACHE_TTL", "3600"))
+MONTH_CACHE_TTL = float(os.getenv("MONTH_CACHE_TTL", "300"))
+TEAM_CALENDAR_CACHE_TTL = float(os.getenv("TEAM_CALENDAR_CACHE_TTL", "30"))
+
+_departments_adapter = TypeAdapter(list[schemas.DepartmentOut])
+_users_adapter = TypeAdapter(list[schemas.UserOut])
+
+# Loaders for lists serialized as UserOut: batch vacation days in one IN query
+# and raise on any other lazy load so N+1 regressions fail loudly
+USER_OUT_LOADERS = (
+    joinedload(models.User.department),
+    selectinload(models.User.vacation_days).lazyload(models.UserVacationDays.user),
+    raiseload("*"),
+)
+
+# Short-lived cache of authenticated users' column values, keyed by X-User-Id
+USER_CACHE_TTL_SECONDS = 5.0
+USER_CACHE_MAXSIZE = 1024
+_user_cache: dict[int, tuple[float, dict]] = {}
+# Requests run on the threadpool, so every read and write of _user_cache holds this
+_user_cache_lock = threading.Lock()
+
+# Set once more than one user exists, so require_admin stops counting users.
+# Only True is cached: a stale True can only deny the bootstrap shortcut.
+_multi_user_cache: bool | None = None
 
 # Flag to track if tables have been initialized
 _tables_initialized = False
@@ -50,7 +87,9 @@ def init_db():
 async def lifespan(app: FastAPI):
     """Lifespan events for startup and shutdown."""
     logger.info(f"Starting OfficeCalendar API in {ENVIRONMENT} mode")
-    # Defer table creation to lazy initialization
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    if not LAZY_DB_INIT:
+        await anyio.to_thread.run_sync(init_db)
     yield
     logger.info("Shutting down OfficeCalendar API")
 
@@ -60,6 +99,7 @@ app = FastAPI(
     description="Office calendar management system",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/api/docs" if ENVIRONMENT == "development" else None,
     redoc_url="/api/redoc" if ENVIRONMENT == "development" else None,
 )
@@ -90,25 +130,79 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
-# Dependency injection
-def get_db() -> Session:
-    """Get database session dependency."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def json_response(model: BaseModel) -> Response:
+    """
+    Serialize a response model with pydantic-core and return it as-is.
+    
+    Returning a Response skips FastAPI's response_model re-validation and
+    jsonable_encoder pass; response_model stays on the route for OpenAPI.
+    """
+    return raw_json_response(model.model_dump_json())
+
+
+def invalidate_month_caches(year: int, month: int) -> None:
+    """Drop cached month and team calendar bodies after a month or day changes."""
+    response_cache.invalidate("month", year, month)
+    response_cache.invalidate("team", year, month)
+
 
+def raw_json_response(body: str) -> Response:
+    """Wrap an already-serialized JSON body, e.g. one from the response cache."""
+    return Response(content=body, media_type="application/json")
 
+
+# Dependency injection
 DbSession = Annotated[Session, Depends(get_db)]
 
 
+def cache_user(user: models.User) -> None:
+    """Remember a user's column values for USER_CACHE_TTL_SECONDS."""
+    columns = {attr.key: getattr(user, attr.key) for attr in models.User.__mapper__.column_attrs}
+    with _user_cache_lock:
+        if user.id not in _user_cache and len(_user_cache) >= USER_CACHE_MAXSIZE:
+            _user_cache.pop(next(iter(_user_cache)), None)
+        _user_cache[user.id] = (time.monotonic() + USER_CACHE_TTL_SECONDS, columns)
+
+
+def get_cached_user(db: Session, user_id: int) -> models.User | None:
+    """Attach a cached user to the session without a SELECT, if still fresh."""
+    with _user_cache_lock:
+        entry = _user_cache.get(user_id)
+        if entry is None:
+            return None
+        expires_at, columns = entry
+        if expires_at < time.monotonic():
+            _user_cache.pop(user_id, None)
+            return None
+    user = models.User(**columns)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Drop a user from the authentication cache after it changes."""
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+
+
+def load_user_out(db: Session, user_id: int) -> models.User:
+    """Reload a user with everything UserOut needs in one round of queries."""
+    return db.scalars(
+        select(models.User)
+        .options(*USER_OUT_LOADERS)
+        .where(models.User.id == user_id)
+        .execution_options(populate_existing=True)
+    ).one()
+
+
 def get_current_user(
     db: Session = Depends(get_db),
     x_user_id: int | None = Header(default=None, alias="X-User-Id"),
 ) -> models.User:
     """Get current authenticated user from X-User-Id header."""
-    init_db()  # Ensure tables are initialized before using DB
+    if not _tables_initialized:
+        # LAZY_DB_INIT, or startup couldn't reach the database: keep retrying until it does
+        init_db()
     if x_user_id is None:
         logger.warning("Authentication failed: Missing X-User-Id header")
         raise HTTPException(
@@ -117,26 +211,57 @@ def get_current_user(
             headers={"WWW-Authenticate": "X-User-Id"},
         )
     
-    user = db.scalars(
-        select(models.User).where(models.User.id == x_user_id)
-    ).first()
-    if not user:
-        logger.warning(f"Authentication failed: User {x_user_id} not found")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid user credentials",
-        )
+    user = get_cached_user(db, x_user_id)
+    if user is None:
+        # Authentication never reads vacation days; skip the selectin query
+        user = db.scalars(
+            select(models.User)
+            .where(models.User.id == x_user_id)
+            .options(lazyload(models.User.vacation_days))
+        ).first()
+        if not user:
+            logger.warning(f"Authentication failed: User {x_user_id} not found")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid user credentials",
+            )
+        cache_user(user)
     
     logger.debug(f"User {user.id} ({user.email}) authenticated")
     return user
 
 
+def email_taken(db: Session, email: str, exclude_user_id: int | None = None) -> bool:
+    """Check whether another user already has this email, e.g. after an IntegrityError."""
+    condition = models.User.email == email
+    if exclude_user_id is not None:
+        condition = and_(condition, models.User.id != exclude_user_id)
+    return bool(db.scalar(select(exists().where(condition))))
+
+
+def has_multiple_users(db: Session, user_id: int) -> bool:
+    """Check whether any user other than user_id exists, caching a positive answer."""
+    global _multi_user_cache
+    if _multi_user_cache:
+        return True
+    # EXISTS stops at the first matching row instead of counting the table
+    if db.scalar(select(exists().where(models.User.id != user_id))):
+        _multi_user_cache = True
+        return True
+    return False
+
+
+def invalidate_user_count() -> None:
+    """Forget the cached user-count check after users are added or removed."""
+    global _multi_user_cache
+    _multi_user_cache = None
+
+
 def require_admin(user: models.User = Depends(get_current_user), db: Session = Depends(get_db)) -> models.User:
     """Require admin role for accessing the endpoint."""
     if user.role != models.Role.admin:
         # Allow first user to be admin (initial setup)
-        user_count = db.query(models.User).count()
-        if user_count > 1:
+        if has_multiple_users(db, user.id):
             logger.warning(f"Authorization failed: User {user.id} is not admin")
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -174,9 +299,7 @@ def seed_data(
     x_user_id: int | None = Header(default=None, alias="X-User-Id"),
 ):
     """Seed the database with initial data. Requires admin privileges if users exist."""
-    user_count = db.query(models.User).count()
-    
-    if user_count > 0:
+    if db.scalar(select(exists().select_from(models.User))):
         if x_user_id is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -191,6 +314,8 @@ def seed_data(
 
     try:
         seed_module.seed()
+        response_cache.invalidate("departments")
+        response_cache.invalidate("team")
         logger.info("Database seeded successfully")
         return {"status": "success", "message": "Database seeded"}
     except Exception as e:
@@ -217,10 +342,13 @@ def create_department(
     try:
         dept = models.Department(name=payload.name)
         db.add(dept)
+        db.flush()
+        # Build the response from flushed state; avoids a refresh SELECT after commit
+        result = schemas.DepartmentOut.model_validate(dept)
         db.commit()
-        db.refresh(dept)
-        logger.info(f"Department created: {dept.name} (ID: {dept.id})")
-        return dept
+        response_cache.invalidate("departments")
+        logger.info(f"Department created: {result.name} (ID: {result.id})")
+        return result
     except Exception as e:
         db.rollback()
         logger.error(f"Failed to create department: {e}")
@@ -233,7 +361,16 @@ def create_department(
 @app.get("/departments", response_model=list[schemas.DepartmentOut], tags=["departments"])
 def list_departments(db: Session = Depends(get_db)):
     """List all departments."""
-    return db.query(models.Department).order_by(models.Department.name).all()
+    cached = response_cache.get(("departments",))
+    if cached is not None:
+        return raw_json_response(cached)
+    generation = response_cache.generation(("departments",))
+    departments = db.query(models.Department).order_by(models.Department.name).all()
+    body = _departments_adapter.dump_json(
+        _departments_adapter.validate_python(departments, from_attributes=True)
+    ).decode()
+    response_cache.set(("departments",), body, DEPARTMENTS_CACHE_TTL, generation)
+    return raw_json_response(body)
 
 
 # User endpoints
@@ -249,33 +386,34 @@ def create_user(payload: schemas.UserCreate, db: Session = Depends(get_db)):
         payload_dict = payload.model_dump()
         vacation_days = payload_dict.pop("vacation_days", None)
         
-        # Check for duplicate email
-        existing_user = db.query(models.User).filter(
-            models.User.email == payload.email
-        ).first()
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"User with email {payload.email} already exists",
-            )
-        
         user = models.User(**payload_dict)
         db.add(user)
-        db.flush()
+        try:
+            db.flush()
+        except IntegrityError:
+            # users.email is UNIQUE; let the constraint catch duplicates instead of a pre-check SELECT.
+            # Any other violation (e.g. unknown department_id) goes to the generic 400 path.
+            db.rollback()
+            if email_taken(db, payload.email):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"User with email {payload.email} already exists",
+                )
+            raise
         
-        # Add vacation day types if provided
+        # Add vacation day types if provided, in one multi-row INSERT
         if vacation_days:
-            for vacation_type, days_per_year in vacation_days.items():
-                vacation_entry = models.UserVacationDays(
-                    user_id=user.id,
-                    vacation_type=vacation_type,
-                    days_per_year=days_per_year,
-                )
-                db.add(vacation_entry)
+            db.execute(
+                insert(models.UserVacationDays),
+                [
+                    {"user_id": user.id, "vacation_type": vacation_type, "days_per_year": days_per_year}
+                    for vacation_type, days_per_year in vacation_days.items()
+                ],
+            )
         
         db.commit()
-        db.refresh(user)
-        db.refresh(user, ["vacation_days"])
+        response_cache.invalidate("team")
+        user = load_user_out(db, user.id)
         logger.info(f"User created: {user.email} (ID: {user.id})")
         return user
     except HTTPException:
@@ -293,7 +431,16 @@ def create_user(payload: schemas.UserCreate, db: Session = Depends(get_db)):
 @app.get("/users", response_model=list[schemas.UserOut], tags=["users"])
 def list_users(db: Session = Depends(get_db)):
     """List all users."""
-    return db.query(models.User).order_by(models.User.display_name).all()
+    # Stream in batches and convert each user to UserOut right away, so the
+    # whole table is never held as ORM objects at once
+    users = db.scalars(
+        select(models.User)
+        .options(*USER_OUT_LOADERS)
+        .order_by(models.User.display_name)
+        .execution_options(yield_per=500)
+    )
+    items = [schemas.UserOut.model_validate(user) for user in users]
+    return raw_json_response(_users_adapter.dump_json(items).decode())
 
 
 @app.put("/users/{user_id}", response_model=schemas.UserOut, tags=["users"])
@@ -315,42 +462,45 @@ def update_user(
         # Update only provided fields
         update_data = payload.model_dump(exclude_unset=True)
         vacation_days = update_data.pop("vacation_days", None)
-        
-        # Check email uniqueness if being updated
-        if "email" in update_data and update_data["email"] != user.email:
-            existing_user = db.query(models.User).filter(
-                models.User.email == update_data["email"],
-                models.User.id != user_id,
-            ).first()
-            if existing_user:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f"User with email {update_data['email']} already exists",
-                )
+        email_changed = "email" in update_data and update_data["email"] != user.email
         
         for key, value in update_data.items():
             setattr(user, key, value)
         
+        if email_changed:
+            # Flush now so a duplicate email surfaces as a UNIQUE violation
+            try:
+                db.flush()
+            except IntegrityError:
+                db.rollback()
+                if email_taken(db, update_data["email"], exclude_user_id=user_id):
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail=f"User with email {update_data['email']} already exists",
+                    )
+                raise
+        
         # Update vacation day types if provided
         if vacation_days is not None:
-            # Delete existing vacation day types
-            db.query(models.UserVacationDays).filter(
-                models.UserVacationDays.user_id == user_id
-            ).delete(synchronize_session=False)
-            db.flush()
-            
-            # Add new vacation day types
-            for vacation_type, days_per_year in vacation_days.items():
-                vacation_entry = models.UserVacationDays(
-                    user_id=user_id,
-                    vacation_type=vacation_type,
-                    days_per_year=days_per_year,
+            # Replace existing vacation day types: one DELETE plus one multi-row INSERT
+            db.execute(
+                delete(models.UserVacationDays)
+                .where(models.UserVacationDays.user_id == user_id)
+                .execution_options(synchronize_session=False)
+            )
+            if vacation_days:
+                db.execute(
+                    insert(models.UserVacationDays),
+                    [
+                        {"user_id": user_id, "vacation_type": vacation_type, "days_per_year": days_per_year}
+                        for vacation_type, days_per_year in vacation_days.items()
+                    ],
                 )
-                db.add(vacation_entry)
         
         db.commit()
-        db.refresh(user)
-        db.refresh(user, ["vacation_days"])
+        invalidate_cached_user(user_id)
+        response_cache.invalidate("team")
+        user = load_user_out(db, user_id)
         logger.info(f"User updated: {user.email} (ID: {user.id})")
         return user
     except HTTPException:
@@ -380,22 +530,13 @@ def delete_user(
         )
 
     try:
-        # Delete related records (cascading)
-        db.query(models.UserDayStatus).filter(
-            models.UserDayStatus.user_id == user_id
-        ).delete(synchronize_session=False)
-        
-        db.query(models.AnnualRemoteCounter).filter(
-            models.AnnualRemoteCounter.user_id == user_id
-        ).delete(synchronize_session=False)
-        
-        db.query(models.UserVacationDays).filter(
-            models.UserVacationDays.user_id == user_id
-        ).delete(synchronize_session=False)
-
-        db.delete(user)
+        # Statuses, counters and vacation days go with it via ON DELETE CASCADE
+        db.execute(delete(models.User).where(models.User.id == user_id))
         db.commit()
-        logger.info(f"User deleted: {user.email} (ID: {user.id})")
+        invalidate_cached_user(user_id)
+        invalidate_user_count()
+        response_cache.invalidate("team")
+        logger.info(f"User deleted: {user.email} (ID: {user_id})")
         return {"status": "success", "message": f"User {user_id} deleted"}
     except Exception as e:
         db.rollback()
@@ -419,7 +560,14 @@ def get_month(year: int, month: int, db: Session = Depends(get_db)):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Month must be between 1 and 12",
         )
-    return crud.get_or_create_month(db, year, month)
+    cached = response_cache.get(("month", year, month))
+    if cached is not None:
+        return raw_json_response(cached)
+    generation = response_cache.generation(("month", year, month))
+    month_obj = crud.get_or_create_month(db, year, month)
+    body = schemas.CalendarMonthOut.model_validate(month_obj).model_dump_json()
+    response_cache.set(("month", year, month), body, MONTH_CACHE_TTL, generation)
+    return raw_json_response(body)
 
 
 @app.post(
@@ -443,10 +591,11 @@ def lock_month(
     month_obj = crud.get_or_create_month(db, year, month)
     month_obj.is_locked = True
     db.add(month_obj)
+    result = schemas.CalendarMonthOut.model_validate(month_obj)
     db.commit()
-    db.refresh(month_obj)
+    invalidate_month_caches(year, month)
     logger.info(f"Month locked: {year}-{month:02d}")
-    return month_obj
+    return result
 
 
 @app.post(
@@ -470,10 +619,11 @@ def unlock_month(
     month_obj = crud.get_or_create_month(db, year, month)
     month_obj.is_locked = False
     db.add(month_obj)
+    result = schemas.CalendarMonthOut.model_validate(month_obj)
     db.commit()
-    db.refresh(month_obj)
+    invalidate_month_caches(year, month)
     logger.info(f"Month unlocked: {year}-{month:02d}")
-    return month_obj
+    return result
 
 
 # User calendar endpoints
@@ -561,11 +711,9 @@ def update_user_calendar(
         )
 
     try:
-        # Delete all existing entries for this user and month first
-        crud.delete_user_month_statuses(db, user_id, month_obj)
-
-        # Then add the new ones
-        day_by_date = {day.date: day for day in month_obj.days}
+        # Upsert the submitted days in one statement, then drop the ones no longer present
+        day_by_date = month_obj.days_by_date
+        pairs: list[tuple[int, models.DayStatus]] = []
         for item in payload.items:
             day = day_by_date.get(item.date)
             if not day:
@@ -573,17 +721,27 @@ def update_user_calendar(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Invalid date: {item.date} is not in {year}-{month:02d}",
                 )
-            crud.upsert_user_day_status(db, user_id, day, item.status)
+            pairs.append((day.id, item.status))
+        crud.upsert_user_day_statuses(db, user_id, pairs)
+        crud.delete_user_month_statuses(
+            db, user_id, month_obj, keep_day_ids=[day_id for day_id, _ in pairs]
+        )
 
+        # After the write the month holds exactly the submitted days, so answer from
+        # the payload instead of re-reading; build it before commit expires the objects
+        submitted = {item.date: item.status for item in payload.items}
+        result = schemas.UserCalendarOut(
+            user=user,
+            month=month_obj,
+            items=[
+                schemas.UserDayStatusOut(date=day, status=status)
+                for day, status in sorted(submitted.items())
+            ],
+        )
         db.commit()
+        response_cache.invalidate("team", year)
         logger.info(f"Calendar updated for user {user_id}, month {year}-{month:02d}")
-        
-        statuses = crud.get_statuses_for_user_month(db, user_id, month_obj)
-        items = [
-            schemas.UserDayStatusOut(date=day, status=status)
-            for day, status in statuses.items()
-        ]
-        return schemas.UserCalendarOut(user=user, month=month_obj, items=items)
+        return result
     except HTTPException:
         db.rollback()
         raise
@@ -609,33 +767,50 @@ def get_team_calendar(year: int, month: int, db: Session = Depends(get_db)):
             detail="Month must be between 1 and 12",
         )
     
+    cached = response_cache.get(("team", year, month))
+    if cached is not None:
+        return raw_json_response(cached)
+    generation = response_cache.generation(("team", year, month))
+
     month_obj = crud.get_or_create_month(db, year, month)
-    users = db.query(models.User).order_by(models.User.display_name).all()
-    status_map = crud.get_statuses_for_month(db, month_obj)
-    notes_map = crud.get_notes_for_month(db, month_obj)
+    status_map, notes_map = crud.get_month_view(db, month_obj)
 
-    month_start = min(day.date for day in month_obj.days)
-    month_end = max(day.date for day in month_obj.days)
-    start_end_date = month_start - timedelta(days=1)
+    start_end_date = date(year, month, 1) - timedelta(days=1)
 
+    remote_counts = crud.count_remote_days_bulk(db, year, [start_end_date, date(year, 12, 31)])
+
+    # Stream users in batches; each is converted to UserOut right away, so the
+    # ORM objects of a finished batch can be released
+    users = db.scalars(
+        select(models.User)
+        .options(*USER_OUT_LOADERS)
+        .order_by(models.User.display_name)
+        .execution_options(yield_per=500)
+    )
+    # Rows carry per-day lists aligned with month.days instead of date-keyed dicts,
+    # so the payload doesn't repeat every date for every user
+    month_dates = [day.date for day in month_obj.days]
     rows: list[schemas.TeamRowOut] = []
     for user in users:
-        used_before_month = crud.count_remote_days_until(db, user.id, year, start_end_date)
-        used_total_year = crud.count_remote_days(db, user.id, year)
+        used_before_month, used_total_year = remote_counts.get(user.id, (0, 0))
+        user_statuses = status_map.get(user.id, {})
+        user_notes = notes_map.get(user.id, {})
         limit = user.annual_remote_limit or 100
         remaining_start = limit - used_before_month
         remaining_end = limit - used_total_year
         rows.append(
             schemas.TeamRowOut(
                 user=user,
-                statuses=status_map.get(user.id, {}),
-                notes=notes_map.get(user.id, {}),
+                statuses=[user_statuses.get(day) for day in month_dates],
+                notes=[user_notes.get(day) for day in month_dates],
                 remote_remaining_start=remaining_start,
                 remote_remaining_end=remaining_end,
             )
         )
 
-    return schemas.TeamCalendarOut(month=month_obj, rows=rows)
+    body = schemas.TeamCalendarOut(month=month_obj, rows=rows).model_dump_json()
+    response_cache.set(("team", year, month), body, TEAM_CALENDAR_CACHE_TTL, generation)
+    return raw_json_response(body)
 
 
 @app.put(
@@ -647,26 +822,24 @@ def set_workday_override(
     year: int,
     month: int,
     day_date: date,
-    payload: dict,
+    payload: schemas.WorkdayOverrideUpdate,
     db: Session = Depends(get_db),
     _: models.User = Depends(require_admin),
 ):
     """Override workday status for a specific day. Requires admin privileges."""
-    month_obj = crud.get_or_create_month(db, year, month)
-    day = next((d for d in month_obj.days if d.date == day_date), None)
+    is_workday_override = payload.is_workday_override
+    day = crud.update_day(db, year, month, day_date, {"is_workday_override": is_workday_override})
     if not day:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Day {day_date} not found in month {year}-{month:02d}",
         )
 
-    is_workday_override = bool(payload.get("is_workday_override"))
-    day.is_workday_override = is_workday_override
-    db.add(day)
+    result = schemas.CalendarDayOut.model_validate(day)
     db.commit()
-    db.refresh(day)
+    invalidate_month_caches(year, month)
     logger.info(f"Workday override set for {day_date}: {is_workday_override}")
-    return day
+    return result
 
 
 @app.put(
@@ -678,26 +851,24 @@ def set_holiday(
     year: int,
     month: int,
     day_date: date,
-    payload: dict,
+    payload: schemas.HolidayUpdate,
     db: Session = Depends(get_db),
     _: models.User = Depends(require_admin),
 ):
     """Mark a day as holiday or regular day. Requires admin privileges."""
-    month_obj = crud.get_or_create_month(db, year, month)
-    day = next((d for d in month_obj.days if d.date == day_date), None)
+    is_holiday = payload.is_holiday
+    day = crud.update_day(db, year, month, day_date, {"is_holiday": is_holiday})
     if not day:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Day {day_date} not found in month {year}-{month:02d}",
         )
 
-    is_holiday = bool(payload.get("is_holiday"))
-    day.is_holiday = is_holiday
-    db.add(day)
+    result = schemas.CalendarDayOut.model_validate(day)
     db.commit()
-    db.refresh(day)
+    invalidate_month_caches(year, month)
     logger.info(f"Holiday status set for {day_date}: {is_holiday}")
-    return day
+    return result
 
 
 @app.put(
@@ -710,13 +881,12 @@ def update_day_note(
     year: int,
     month: int,
     day_date: date,
-    payload: dict,
+    payload: schemas.DayNoteUpdate,
     db: Session = Depends(get_db),
     _: models.User = Depends(require_admin),
 ):
     """Update note and status for a specific day. Requires admin privileges."""
-    month_obj = crud.get_or_create_month(db, year, month)
-    day = next((d for d in month_obj.days if d.date == day_date), None)
+    day = crud.get_day(db, year, month, day_date)
     if not day:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -736,43 +906,34 @@ def update_day_note(
         .where(models.UserDayStatus.day_id == day.id)
     )
 
-    status_value = payload.get("status")
+    status_value = payload.status
     if status_value == "clear":
         if user_day_status:
             db.delete(user_day_status)
             db.commit()
+            response_cache.invalidate("team", year)
             logger.info(f"Cleared status for user {user_id} on {day_date}")
         return {"success": True, "note": None, "status": None}
     
     try:
         if not user_day_status:
             # Create new status entry
-            if status_value:
-                try:
-                    status_enum = models.DayStatus(status_value)
-                except ValueError:
-                    status_enum = models.DayStatus.office
-            else:
-                status_enum = models.DayStatus.office
-
             user_day_status = models.UserDayStatus(
                 user_id=user_id,
                 day_id=day.id,
-                status=status_enum,
-                note=payload.get("note"),
+                status=status_value or models.DayStatus.office,
+                note=payload.note,
             )
             db.add(user_day_status)
         else:
             # Update existing status
             if status_value:
-                try:
-                    user_day_status.status = models.DayStatus(status_value)
-                except ValueError:
-                    logger.warning(f"Invalid status value: {status_value}")
-            user_day_status.note = payload.get("note")
+                user_day_status.status = status_value
+            user_day_status.note = payload.note
             db.add(user_day_status)
         
         db.commit()
+        response_cache.invalidate("team", year)
         db.refresh(user_day_status)
         logger.info(f"Updated note for user {user_id} on {day_date}")
         return {
@@ -796,29 +957,33 @@ def update_day_note(
 )
 def who_is_in_office(target_date: date, db: Session = Depends(get_db)):
     """Get a breakdown of users by their status for a specific date."""
-    month_obj = crud.get_or_create_month(db, target_date.year, target_date.month)
-    day = next((d for d in month_obj.days if d.date == target_date), None)
+    day = crud.get_day(db, target_date.year, target_date.month, target_date)
     if not day:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Day {target_date} not found",
         )
 
-    users = db.query(models.User).all()
     by_status: dict[models.DayStatus, list[models.User]] = {
         status: [] for status in models.DayStatus
     }
 
-    statuses = db.query(models.UserDayStatus).filter(
-        models.UserDayStatus.day_id == day.id
+    # Users without an entry for the day default to office
+    rows = db.execute(
+        select(models.User, models.UserDayStatus.status)
+        .outerjoin(
+            models.UserDayStatus,
+            and_(
+                models.UserDayStatus.user_id == models.User.id,
+                models.UserDayStatus.day_id == day.id,
+            ),
+        )
+        .options(*USER_OUT_LOADERS)
     ).all()
-    status_map = {s.user_id: s.status for s in statuses}
-
-    for user in users:
-        status_value = status_map.get(user.id, models.DayStatus.office)
-        by_status[status_value].append(user)
+    for user, status_value in rows:
+        by_status[status_value or models.DayStatus.office].append(user)
 
-    return schemas.WhoIsInOfficeOut(date=target_date, by_status=by_status)
+    return json_response(schemas.WhoIsInOfficeOut(date=target_date, by_status=by_status))
 
 
 @app.get(
@@ -854,8 +1019,6 @@ def get_vacation_counter(
     current_user: models.User = Depends(get_current_user),
 ):
     """Get vacation counter for the current user."""
-    from . import utils
-    
     # Calculate accrued vacation days
     accrued = utils.calculate_vacation_days_accrued(
         current_user.start_date,
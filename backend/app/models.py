@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import enum
 from datetime import date
+from functools import cached_property
 from typing import TYPE_CHECKING
 
 from sqlalchemy import Boolean, Date, Enum, ForeignKey, Integer, String, UniqueConstraint, Index
@@ -65,13 +66,15 @@ class User(Base):
         "UserDayStatus",
         back_populates="user",
         cascade="all, delete-orphan",
+        passive_deletes=True,
         lazy="select",
     )
     vacation_days: Mapped[list[UserVacationDays]] = relationship(
         "UserVacationDays",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="joined",
+        passive_deletes=True,
+        lazy="selectin",
     )
 
     def __repr__(self) -> str:
@@ -95,10 +98,15 @@ class CalendarMonth(Base):
         "CalendarDay",
         back_populates="month",
         cascade="all, delete-orphan",
-        lazy="joined",
+        lazy="select",
         order_by="CalendarDay.date",
     )
 
+    @cached_property
+    def days_by_date(self) -> dict[date, CalendarDay]:
+        """Days of the month keyed by date, built once per instance."""
+        return {day.date: day for day in self.days}
+
     def __repr__(self) -> str:
         return f"<CalendarMonth(id={self.id}, year={self.year}, month={self.month}, locked={self.is_locked})>"
 
@@ -107,13 +115,13 @@ class CalendarDay(Base):
     """Individual calendar day within a month."""
     __tablename__ = "calendar_days"
     __table_args__ = (
+        # Also serves month_id lookups, so month_id needs no index of its own
         UniqueConstraint("month_id", "date", name="uq_month_date"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     month_id: Mapped[int] = mapped_column(
         ForeignKey("calendar_months.id", ondelete="CASCADE"),
-        index=True,
         nullable=False,
     )
     date: Mapped[date] = mapped_column(Date, nullable=False)
@@ -140,9 +148,10 @@ class UserDayStatus(Base):
     __tablename__ = "user_day_statuses"
     __table_args__ = (
         UniqueConstraint("user_id", "day_id", name="uq_user_day"),
-        Index("ix_user_day_statuses_user_id", "user_id"),
-        Index("ix_user_day_statuses_day_id", "day_id"),
-        Index("ix_user_day_statuses_status", "status"),
+        Index("ix_user_day_statuses_user_id_status", "user_id", "status"),
+        # Covers the month/day views (join on day_id, read user_id and status) and
+        # still serves plain day_id lookups
+        Index("ix_user_day_statuses_day_id_user_id_status", "day_id", "user_id", "status"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -158,8 +167,8 @@ class UserDayStatus(Base):
     note: Mapped[str | None] = mapped_column(String(500), nullable=True)
 
     # Relationships
-    user: Mapped[User] = relationship("User", back_populates="statuses", lazy="joined")
-    day: Mapped[CalendarDay] = relationship("CalendarDay", back_populates="statuses", lazy="joined")
+    user: Mapped[User] = relationship("User", back_populates="statuses", lazy="select")
+    day: Mapped[CalendarDay] = relationship("CalendarDay", back_populates="statuses", lazy="select")
 
     def __repr__(self) -> str:
         return f"<UserDayStatus(id={self.id}, user_id={self.user_id}, day_id={self.day_id}, status='{self.status}')>"
@@ -202,7 +211,7 @@ class UserVacationDays(Base):
     days_per_year: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
     # Relationships
-    user: Mapped[User] = relationship("User", back_populates="vacation_days", lazy="joined")
+    user: Mapped[User] = relationship("User", back_populates="vacation_days", lazy="select")
 
     def __repr__(self) -> str:
         return f"<UserVacationDays(id={self.id}, user_id={self.user_id}, type='{self.vacation_type}', days={self.days_per_year})>"
\ No newline at end of file
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Annotated
+from typing import Annotated, Literal
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from .models import DayStatus, Role
@@ -109,6 +109,22 @@ class UserCalendarUpdate(BaseModel):
     items: list[DayStatusUpdate] = Field(default_factory=list, description="List of day status updates")
 
 
+class WorkdayOverrideUpdate(BaseModel):
+    """Schema for setting a day's workday override."""
+    is_workday_override: bool
+
+
+class HolidayUpdate(BaseModel):
+    """Schema for marking a day as holiday."""
+    is_holiday: bool
+
+
+class DayNoteUpdate(BaseModel):
+    """Schema for updating a single day's status and note; status "clear" removes the entry."""
+    status: DayStatus | Literal["clear"] | None = None
+    note: Annotated[str | None, Field(default=None, max_length=500, description="Optional note")]
+
+
 class UserDayStatusOut(BaseModel):
     """Schema for user day status output."""
     date: date
@@ -124,10 +140,10 @@ class UserCalendarOut(BaseModel):
 
 
 class TeamRowOut(BaseModel):
-    """Schema for team calendar row output."""
+    """Schema for team calendar row output; statuses and notes are aligned with month.days."""
     user: UserOut
-    statuses: dict[date, DayStatus | None]
-    notes: dict[date, str | None]
+    statuses: Annotated[list[DayStatus | None], Field(description="Status per day of the month, in month.days order")]
+    notes: Annotated[list[str | None], Field(description="Note per day of the month, in month.days order")]
     remote_remaining_start: Annotated[int, Field(description="Remote days remaining at month start")]
     remote_remaining_end: Annotated[int, Field(description="Remote days remaining at month end")]
 
@@ -5,6 +5,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from sqlalchemy import exists, insert, select
 from sqlalchemy.orm import Session
 
 from app.database import Base, SessionLocal, engine
@@ -33,49 +34,59 @@ def seed():
             "Trainings",
         ]
         
-        dept_objs = []
-        for dept_name in department_names:
-            existing_dept = db.query(models.Department).filter_by(name=dept_name).first()
-            if existing_dept:
-                dept_objs.append(existing_dept)
-            else:
-                dept = models.Department(name=dept_name)
-                db.add(dept)
-                dept_objs.append(dept)
-        
-        db.flush()
+        # One lookup for the names already present, one multi-row INSERT for the rest
+        existing_names = set(
+            db.scalars(
+                select(models.Department.name).where(models.Department.name.in_(department_names))
+            )
+        )
+        missing = [{"name": name} for name in department_names if name not in existing_names]
+        if missing:
+            db.execute(insert(models.Department), missing)
         
         # Only create demo users if none exist
-        if db.query(models.User).count() > 0:
+        if db.scalar(select(exists().select_from(models.User))):
             db.commit()
             return
 
         # Get HR and Development departments for demo users
-        hr_dept = next((d for d in dept_objs if d.name == "HR"), dept_objs[0])
-        dev_dept = next((d for d in dept_objs if d.name == "Development"), dept_objs[0])
-
-        admin = models.User(
-            display_name="Admin HR",
-            email="admin@example.com",
-            role=models.Role.admin,
-            annual_remote_limit=100,
-            department_id=hr_dept.id,
+        dept_ids = dict(
+            db.execute(
+                select(models.Department.name, models.Department.id).where(
+                    models.Department.name.in_(["HR", "Development"])
+                )
+            ).all()
         )
-        alice = models.User(
-            display_name="Alex",
-            email="alex@example.com",
-            role=models.Role.employee,
-            annual_remote_limit=100,
-            department_id=dev_dept.id,
-        )
-        bob = models.User(
-            display_name="Sergey",
-            email="sergey@example.com",
-            role=models.Role.manager,
-            annual_remote_limit=100,
-            department_id=dev_dept.id,
+        hr_dept_id = dept_ids["HR"]
+        dev_dept_id = dept_ids["Development"]
+
+        # Plain mappings through one executemany INSERT; no ORM instances needed
+        db.execute(
+            insert(models.User),
+            [
+                {
+                    "display_name": "Admin HR",
+                    "email": "admin@example.com",
+                    "role": models.Role.admin,
+                    "annual_remote_limit": 100,
+                    "department_id": hr_dept_id,
+                },
+                {
+                    "display_name": "Alex",
+                    "email": "alex@example.com",
+                    "role": models.Role.employee,
+                    "annual_remote_limit": 100,
+                    "department_id": dev_dept_id,
+                },
+                {
+                    "display_name": "Sergey",
+                    "email": "sergey@example.com",
+                    "role": models.Role.manager,
+                    "annual_remote_limit": 100,
+                    "department_id": dev_dept_id,
+                },
+            ],
         )
-        db.add_all([admin, alice, bob])
         db.commit()
     finally:
         db.close()
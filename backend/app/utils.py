@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import calendar
+import functools
 from datetime import date
 from typing import Final
 
@@ -8,9 +9,11 @@ from typing import Final
 # Constants
 VACATION_DAYS_PER_YEAR: Final[int] = 20
 VACATION_DAYS_PER_MONTH: Final[float] = VACATION_DAYS_PER_YEAR / 12
+WEEKDAY_NAMES: Final[tuple[str, ...]] = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
 
 
-def month_days(year: int, month: int) -> list[date]:
+@functools.lru_cache(maxsize=512)
+def month_days(year: int, month: int) -> tuple[date, ...]:
     """
     Get all days in a month.
     
@@ -19,10 +22,10 @@ def month_days(year: int, month: int) -> list[date]:
         month: Month (1-12)
     
     Returns:
-        List of date objects for each day in the month
+        Tuple of date objects for each day in the month (cached, so immutable)
     """
     last_day = calendar.monthrange(year, month)[1]
-    return [date(year, month, day) for day in range(1, last_day + 1)]
+    return tuple(date(year, month, day) for day in range(1, last_day + 1))
 
 
 def weekday_name(day: date) -> str:
@@ -35,7 +38,7 @@ def weekday_name(day: date) -> str:
     Returns:
         Abbreviated weekday name (Mon, Tue, etc.)
     """
-    return day.strftime("%a")
+    return WEEKDAY_NAMES[day.weekday()]
 
 
 def is_weekend(day: date) -> bool:
@@ -69,6 +72,7 @@ def calculate_vacation_days_allowed(start_date: date | None, current_year: int)
     return 20
 
 
+@functools.lru_cache(maxsize=4096)
 def calculate_vacation_days_accrued(start_date: date | None, current_year: int, month: int) -> int:
     """
     Calculate vacation days accrued by the end of a given month.
@@ -83,29 +87,14 @@ def calculate_vacation_days_accrued(start_date: date | None, current_year: int,
     Returns:
         Total vacation days accrued by end of the specified month
     """
-    if not start_date:
-        # No start date, assume full accrual
-        return int((min(month, 12) * 20) / 12)
-    
-    # If employee started in a different year, full accrual applies
-    if start_date.year < current_year:
-        return int((min(month, 12) * 20) / 12)
-    
-    # If employee started after the current year, 0 accrual for this year
-    if start_date.year > current_year:
-        return 0
-    
-    # Employee started in current year
-    start_month = start_date.month
-    
-    # If requested month is before start month, no accrual yet
-    if month < start_month:
+    # Started after this year: nothing accrues yet
+    if start_date and start_date.year > current_year:
         return 0
     
-    # Accrual is approximately 1.67 days per month, counting from start month
-    # Employee accrues days starting from their start month
-    months_employed = month - start_month + 1
-    return int((months_employed * 20) / 12)
+    # Accrual counts from the start month in the first year, otherwise from January
+    start_month = start_date.month if start_date and start_date.year == current_year else 1
+    months_employed = min(month, 12) - start_month + 1
+    return (months_employed * VACATION_DAYS_PER_YEAR) // 12 if months_employed > 0 else 0
 
 
 def count_vacation_days_used(statuses: dict[date, str], year: int) -> int:
@@ -121,9 +110,12 @@ def count_vacation_days_used(statuses: dict[date, str], year: int) -> int:
     """
     count = 0
     for date_key, status in statuses.items():
+        # Most entries are not vacation; skip them before any date handling
+        if status != "vacation":
+            continue
         if isinstance(date_key, str):
             date_key = date.fromisoformat(date_key)
-        if date_key.year == year and status == "vacation" and not is_weekend(date_key):
+        if date_key.year == year and date_key.weekday() < 5:
             count += 1
     return count
 
@@ -38,8 +38,9 @@ type TeamCalendar = {
   };
   rows: {
     user: User;
-    statuses: Record<string, DayStatus | null>;
-    notes: Record<string, string | null>;
+    // Aligned with month.days by index
+    statuses: (DayStatus | null)[];
+    notes: (string | null)[];
     remote_remaining_start: number;
     remote_remaining_end: number;
   }[];
@@ -223,6 +224,7 @@ export default function TeamCalendarView() {
   const filteredRows = useMemo(() => {
     if (!calendar) return [];
     const today = new Date().toISOString().split("T")[0];
+    const todayIndex = calendar.month.days.findIndex((day) => day.date === today);
     return calendar.rows.filter((row) => {
       const matchesSearch = row.user.display_name
         .toLowerCase()
@@ -230,7 +232,7 @@ export default function TeamCalendarView() {
       const matchesDepartment =
         department === "all" ||
         (row.user.department && String(row.user.department.id) === department);
-      const matchesStatus = !statusFilter || row.statuses[today] === statusFilter;
+      const matchesStatus = !statusFilter || row.statuses[todayIndex] === statusFilter;
       return matchesSearch && matchesDepartment && matchesStatus;
     });
   }, [calendar, search, department, statusFilter]);
@@ -257,8 +259,8 @@ export default function TeamCalendarView() {
       row.user.display_name,
       row.user.department?.name || "",
       row.remote_remaining_start,
-      ...calendar.month.days.map((day) => {
-        const status = row.statuses[day.date];
+      ...calendar.month.days.map((_day, dayIndex) => {
+        const status = row.statuses[dayIndex];
         return status ? statusLabels[status as DayStatus][0] : "";
       }),
       row.remote_remaining_end,
@@ -413,10 +415,10 @@ export default function TeamCalendarView() {
                     <td>{row.user.display_name}</td>
                     <td>{row.user.department?.name || "—"}</td>
                     <td>{row.remote_remaining_start}</td>
-                    {calendar.month.days.map((day) => {
+                    {calendar.month.days.map((day, dayIndex) => {
                       const today = new Date().toISOString().split('T')[0];
-                      const status = row.statuses[day.date] as DayStatus | undefined;
-                      const note = row.notes[day.date];
+                      const status = row.statuses[dayIndex] ?? undefined;
+                      const note = row.notes[dayIndex];
                       const isNonWorking = isNonWorkingDay(day);
                       const isToday = day.date === today;
                       const isAdmin = currentUser?.role === "admin";
@@ -55,8 +55,9 @@ export interface CalendarMonth {
 
 export interface TeamRow {
   user: User;
-  statuses: Record<string, DayStatus | null>;
-  notes: Record<string, string | null>;
+  // Aligned with TeamCalendar.month.days by index
+  statuses: (DayStatus | null)[];
+  notes: (string | null)[];
   remote_remaining_start: number;
   remote_remaining_end: number;
 }
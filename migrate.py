@@ -1,66 +1,172 @@
 #!/usr/bin/env python
 """Migration script to add new columns to existing database."""
 
+import logging
 import os
-from sqlalchemy import text, inspect
+import sys
+from sqlalchemy import false, inspect, literal, text
 from backend.app.database import engine, Base, SessionLocal
 from backend.app import models
 
+# Silent when imported; the __main__ block below turns output on
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Bump whenever ADDED_COLUMNS or the models' tables/indexes change, so the next run
+# does the full check instead of returning early
+CURRENT_SCHEMA_VERSION = 4
+
+# Columns added after the first release, per table, with the DEFAULT that backfills
+# existing rows; false() renders as FALSE on PostgreSQL, where "BOOLEAN DEFAULT 0" is rejected
+ADDED_COLUMNS = {
+    "users": [
+        (models.User.__table__.c.start_date, None),
+        (models.User.__table__.c.additional_vacation_days, literal(0)),
+        (models.User.__table__.c.carryover_vacation_days, literal(0)),
+    ],
+    "user_day_statuses": [
+        (models.UserDayStatus.__table__.c.note, None),
+    ],
+    "calendar_days": [
+        (models.CalendarDay.__table__.c.is_workday_override, false()),
+    ],
+}
+
+# Indexes earlier releases created that the models no longer declare, per table.
+# Each one is dropped after the replacement indexes exist; MySQL refuses to drop an
+# index a foreign key relies on unless another index leads with the same column
+RETIRED_INDEXES = {
+    "user_day_statuses": [
+        "ix_user_day_statuses_user_id",
+        "ix_user_day_statuses_day_id",
+        "ix_user_day_statuses_status",
+        "ix_user_day_statuses_day_id_status",
+        # Partial remote/vacation indexes: the counters bind status as a parameter,
+        # so planners never matched them; (user_id, status) serves those queries
+        "ix_user_day_statuses_remote",
+        "ix_user_day_statuses_vacation",
+    ],
+    # uq_month_date (month_id, date) already serves month_id lookups
+    "calendar_days": [
+        "ix_calendar_days_month_id",
+    ],
+}
+
+
+def column_ddl(dialect, column, default=None):
+    """Render a model column as an ADD COLUMN fragment, typed and defaulted for the dialect."""
+    ddl = f"{column.name} {column.type.compile(dialect=dialect)}"
+    if default is not None:
+        ddl += f" DEFAULT {default.compile(dialect=dialect, compile_kwargs={'literal_binds': True})}"
+    return ddl
+
+
+def mysql_alter_algorithm(dialect):
+    """Pick the cheapest ALTER TABLE algorithm the MySQL/MariaDB server supports for ADD COLUMN."""
+    version = dialect.server_version_info or ()
+    if getattr(dialect, "is_mariadb", False):
+        instant = version >= (10, 3, 2)
+    else:
+        instant = version >= (8, 0, 12)
+    # INSTANT only touches metadata; INPLACE at least avoids the table lock of a COPY
+    return "ALGORITHM=INSTANT" if instant else "ALGORITHM=INPLACE, LOCK=NONE"
+
+
+def drop_index(connection, table, name):
+    """Drop an index by name, in the syntax the dialect expects."""
+    if connection.dialect.name in ("mysql", "mariadb"):
+        # MySQL has no DROP INDEX IF EXISTS; callers only pass indexes that reflection found
+        connection.execute(text(f"DROP INDEX {name} ON {table}"))
+    else:
+        connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    logger.info(f"✓ Dropped index {name} on {table}")
+
+
+def add_columns(connection, table, columns, if_not_exists=False):
+    """Add (column, default) pairs to a table with as few ALTER TABLE statements as possible."""
+    if not columns:
+        return
+    pending = [(column.name, column_ddl(connection.dialect, column, default)) for column, default in columns]
+    add = "ADD COLUMN IF NOT EXISTS" if if_not_exists else "ADD COLUMN"
+    if connection.dialect.name == "sqlite":
+        # SQLite accepts one ADD COLUMN per ALTER TABLE
+        for _, ddl in pending:
+            connection.execute(text(f"ALTER TABLE {table} {add} {ddl}"))
+    else:
+        clauses = ", ".join(f"{add} {ddl}" for _, ddl in pending)
+        if connection.dialect.name in ("mysql", "mariadb"):
+            clauses += f", {mysql_alter_algorithm(connection.dialect)}"
+        connection.execute(text(f"ALTER TABLE {table} {clauses}"))
+    verb = "Ensured" if if_not_exists else "Added"
+    for name, _ in pending:
+        logger.info(f"✓ {verb} column {table}.{name}")
+
+
 def migrate_database():
     """Add missing columns to existing tables."""
     
-    with engine.connect() as connection:
-        inspector = inspect(engine)
+    # One transaction for the whole migration: commits on success, rolls back on error
+    with engine.begin() as connection:
+        # Warm starts: one SELECT against the version marker and nothing else
+        connection.execute(text("CREATE TABLE IF NOT EXISTS _schema_version (version INTEGER PRIMARY KEY)"))
+        if connection.execute(text("SELECT version FROM _schema_version")).scalar() == CURRENT_SCHEMA_VERSION:
+            logger.info("✓ Database schema is up to date")
+            return
+        
+        # Reflect over this connection; the inspector caches results for the whole run
+        inspector = inspect(connection)
+        table_names = set(inspector.get_table_names())
         
-        # Check if User table exists
-        if 'users' in inspector.get_table_names():
-            user_columns = [col['name'] for col in inspector.get_columns('users')]
-            
-            # Add start_date column if missing
-            if 'start_date' not in user_columns:
-                print("Adding start_date column to users table...")
-                connection.execute(text("ALTER TABLE users ADD COLUMN start_date DATE NULL"))
-                connection.commit()
-                print("✓ Added start_date column")
-            
-            # Add additional_vacation_days column if missing
-            if 'additional_vacation_days' not in user_columns:
-                print("Adding additional_vacation_days column to users table...")
-                connection.execute(text("ALTER TABLE users ADD COLUMN additional_vacation_days INTEGER DEFAULT 0"))
-                connection.commit()
-                print("✓ Added additional_vacation_days column")
-            
-            # Add carryover_vacation_days column if missing
-            if 'carryover_vacation_days' not in user_columns:
-                print("Adding carryover_vacation_days column to users table...")
-                connection.execute(text("ALTER TABLE users ADD COLUMN carryover_vacation_days INTEGER DEFAULT 0"))
-                connection.commit()
-                print("✓ Added carryover_vacation_days column")
+        wanted = [name for name in ADDED_COLUMNS if name in table_names]
+        if connection.dialect.name == "postgresql":
+            # ADD COLUMN IF NOT EXISTS is idempotent on its own; no column reflection needed
+            for table in wanted:
+                add_columns(connection, table, ADDED_COLUMNS[table], if_not_exists=True)
+        else:
+            # Reflect the columns of every table we may alter in one bulk call
+            columns_by_table = {
+                table: {col['name'] for col in cols}
+                for (_, table), cols in inspector.get_multi_columns(filter_names=wanted).items()
+            }
+            for table in wanted:
+                existing = columns_by_table[table]
+                add_columns(
+                    connection,
+                    table,
+                    [(column, default) for column, default in ADDED_COLUMNS[table] if column.name not in existing],
+                )
         
-        # Check if user_day_statuses table exists and add note column if missing
-        if 'user_day_statuses' in inspector.get_table_names():
-            status_columns = [col['name'] for col in inspector.get_columns('user_day_statuses')]
-            
-            if 'note' not in status_columns:
-                print("Adding note column to user_day_statuses table...")
-                connection.execute(text("ALTER TABLE user_day_statuses ADD COLUMN note VARCHAR(500) NULL"))
-                connection.commit()
-                print("✓ Added note column")
-
-        # Check if calendar_days table exists and add is_workday_override column if missing
-        if 'calendar_days' in inspector.get_table_names():
-            day_columns = [col['name'] for col in inspector.get_columns('calendar_days')]
-
-            if 'is_workday_override' not in day_columns:
-                print("Adding is_workday_override column to calendar_days table...")
-                connection.execute(text("ALTER TABLE calendar_days ADD COLUMN is_workday_override BOOLEAN DEFAULT 0"))
-                connection.commit()
-                print("✓ Added is_workday_override column")
+        # Create indexes declared on the models that existing tables are missing,
+        # then drop the retired ones they replace; one bulk reflection for all tables
+        existing_tables = [table for table in Base.metadata.sorted_tables if table.name in table_names]
+        indexes_by_table = {
+            table: {idx['name'] for idx in indexes}
+            for (_, table), indexes in inspector.get_multi_indexes(
+                filter_names=[table.name for table in existing_tables]
+            ).items()
+        }
+        for table in existing_tables:
+            existing_indexes = indexes_by_table.get(table.name, set())
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(bind=connection)
+                    logger.info(f"✓ Created index {index.name} on {table.name}")
+            for name in sorted(existing_indexes.intersection(RETIRED_INDEXES.get(table.name, ()))):
+                drop_index(connection, table.name, name)
+
+        # Create only the tables that don't exist yet; no has_table probe per model
+        missing_tables = [table for table in Base.metadata.sorted_tables if table.name not in table_names]
+        if missing_tables:
+            Base.metadata.create_all(bind=connection, tables=missing_tables, checkfirst=False)
         
-        # Create all tables (will skip existing ones)
-        Base.metadata.create_all(bind=engine)
-        print("✓ Database schema is up to date")
+        connection.execute(text("DELETE FROM _schema_version"))
+        connection.execute(
+            text("INSERT INTO _schema_version (version) VALUES (:version)"),
+            {"version": CURRENT_SCHEMA_VERSION},
+        )
+        logger.info("✓ Database schema is up to date")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     migrate_database()
-    print("\nMigration complete!")
+    logger.info("Migration complete!")